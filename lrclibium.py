@@ -1,10 +1,14 @@
 import asyncio
-import subprocess
+import bisect
 import re
+import sqlite3
 import httpx
+import orjson
 import urllib.parse
 import datetime
-from collections import OrderedDict
+import time
+from operator import itemgetter
+from dataclasses import dataclass
 from typing import List, Tuple, Optional
 from rich.console import Console
 from rich.live import Live
@@ -12,125 +16,356 @@ from rich.panel import Panel
 from rich.align import Align
 
 console = Console()
-TIMESTAMP_RE = re.compile(r"\[(\d+):(\d+\.\d+)\]")
+TIMESTAMP_RE = re.compile(r"\[(\d+):(\d+(?:\.\d+)?)\]")
 ERROR_LOG = "lyrics_errors.log"
+CACHE_DB = "lyrics_cache.db"
+
+def first_json_object(buf: bytes) -> Optional[bytes]:
+    """Return the first complete {...} object in a JSON array, b"" if the
+    array is empty, or None if more bytes are needed."""
+    depth = 0
+    in_string = False
+    escaped = False
+    start = None
+    for i, byte in enumerate(buf):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif byte == 0x5C:  # backslash
+                escaped = True
+            elif byte == 0x22:  # quote
+                in_string = False
+        elif byte == 0x22:
+            in_string = True
+        elif byte == 0x7B:  # {
+            if start is None:
+                start = i
+            depth += 1
+        elif byte == 0x7D:  # }
+            depth -= 1
+            if depth == 0 and start is not None:
+                return buf[start:i + 1]
+        elif byte == 0x5D and start is None:  # ] before any object
+            return b""
+    return None
 
 def log_error(msg: str):
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     with open(ERROR_LOG, "a") as f:
         f.write(f"[{timestamp}] {msg}\n")
 
+@dataclass(slots=True)
+class LyricsBundle:
+    """Everything the render path needs for one track, computed once."""
+    times: List[float]
+    styled_dim: List[str]
+    styled_bright: List[str]
+    styled_active: List[str]
+    panel_title: str
+
+    @classmethod
+    def build(cls, times: List[float], lines: List[str],
+              artist: Optional[str], title: Optional[str]) -> "LyricsBundle":
+        return cls(
+            times=times,
+            styled_dim=[f"[dim]{line}[/dim]" for line in lines],
+            styled_bright=[f"[bright_white]{line}[/bright_white]" for line in lines],
+            styled_active=[f"[black on cyan]{line}[/black on cyan]" for line in lines],
+            panel_title=f"[bold green]{artist or 'Unknown'} - {title or 'Unknown'}[/bold green]",
+        )
+
 class LyricsManager:
-    def __init__(self, cache_size: int = 50):
-        self.cache = OrderedDict()
+    def __init__(self, cache_size: int = 50, db_path: str = CACHE_DB):
+        self.cache = {}
         self.cache_size = cache_size
+        self._client: Optional[httpx.AsyncClient] = None
+        try:
+            self._db = sqlite3.connect(db_path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS lyrics (key TEXT PRIMARY KEY, ts INTEGER, payload BLOB)"
+            )
+            self._db.commit()
+        except Exception as e:
+            log_error(f"Could not open lyrics cache db {db_path}: {e}")
+            self._db = None
 
-    async def get_lyrics(self, artist: str, title: str) -> List[Tuple[float, str]]:
-        key = f"{artist} - {title}"
-        if key in self.cache:
-            self.cache.move_to_end(key)
-            return self.cache[key]
+    def _get_client(self) -> httpx.AsyncClient:
+        # Created lazily so the client is always bound to the running event loop.
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=5,
+                limits=httpx.Limits(max_keepalive_connections=4),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _lyrics_future(self, key: Tuple[str, str]) -> "asyncio.Future":
+        # Plain dicts keep insertion order, so pop + reinsert is a cheaper
+        # move-to-end; caching the future (not the result) deduplicates
+        # concurrent fetches for the same track.
+        fut = self.cache.pop(key, None)
+        if fut is None:
+            fut = asyncio.ensure_future(self._load_or_fetch(*key))
+        self.cache[key] = fut
+        if len(self.cache) > self.cache_size:
+            del self.cache[next(iter(self.cache))]
+        return fut
+
+    async def get_lyrics(self, artist: str, title: str) -> LyricsBundle:
+        key = (artist, title)
         try:
-            lyrics = await self._fetch_lyrics(artist, title)
+            return await self._lyrics_future(key)
         except Exception as e:
             log_error(f"Failed to fetch lyrics for {artist} - {title}: {e}")
-            return [(0, "❌ Lyrics not found")]
-        self.cache[key] = lyrics
-        if len(self.cache) > self.cache_size:
-            self.cache.popitem(last=False)
-        return lyrics
+            # Drop the failed future so the next lookup retries the fetch.
+            self.cache.pop(key, None)
+            return LyricsBundle.build([0.0], ["❌ Lyrics not found"], artist, title)
+
+    async def _load_or_fetch(self, artist: str, title: str) -> LyricsBundle:
+        key = f"{artist} - {title}"
+        cached = self._db_get(key)
+        if cached is not None:
+            times, lines = cached
+        else:
+            times, lines = await self._fetch_lyrics(artist, title)
+            # Don't persist the ❌ sentinels: a transient network failure
+            # shouldn't stop lyrics from ever being fetched again.
+            if not lines[0].startswith("❌"):
+                self._db_put(key, (times, lines))
+        # The memory LRU holds the finished bundle, so repeat listens skip
+        # parsing, styling and title formatting entirely.
+        return LyricsBundle.build(times, lines, artist, title)
+
+    def _db_get(self, key: str) -> Optional[Tuple[List[float], List[str]]]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT payload FROM lyrics WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            times, lines = orjson.loads(row[0])
+            self._db.execute("UPDATE lyrics SET ts = ? WHERE key = ?", (int(time.time()), key))
+            self._db.commit()
+            return times, lines
+        except Exception as e:
+            log_error(f"Lyrics cache db read failed for {key}: {e}")
+            return None
+
+    def _db_put(self, key: str, lyrics: Tuple[List[float], List[str]]):
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO lyrics (key, ts, payload) VALUES (?, ?, ?)",
+                (key, int(time.time()), orjson.dumps(list(lyrics)))
+            )
+            count = self._db.execute("SELECT COUNT(*) FROM lyrics").fetchone()[0]
+            if count > self.cache_size:
+                self._db.execute(
+                    "DELETE FROM lyrics WHERE key IN "
+                    "(SELECT key FROM lyrics ORDER BY ts LIMIT ?)",
+                    (count - self.cache_size,)
+                )
+            self._db.commit()
+        except Exception as e:
+            log_error(f"Lyrics cache db write failed for {key}: {e}")
+
+    async def _fetch_first_result(self, url: str) -> Optional[dict]:
+        """Stream the search response and decode only the first hit.
+
+        Only data[0] is ever used, so the rest of the array is neither
+        downloaded nor parsed.
+        """
+        async with self._get_client().stream("GET", url) as resp:
+            resp.raise_for_status()
+            if resp.headers.get("content-length") == "2":
+                # An empty result is exactly b"[]"; skip the body.
+                return None
+            buf = b""
+            async for chunk in resp.aiter_bytes():
+                buf += chunk
+                obj = first_json_object(buf)
+                if obj is not None:
+                    # orjson works on the raw bytes, avoiding the str
+                    # decode that resp.json() would do first.
+                    return orjson.loads(obj) if obj else None
+        return None
 
-    async def _fetch_lyrics(self, artist: str, title: str) -> List[Tuple[float, str]]:
+    async def _fetch_lyrics(self, artist: str, title: str) -> Tuple[List[float], List[str]]:
         query = f"{artist} {title}"
         url = f"https://lrclib.net/api/search?q={urllib.parse.quote_plus(query)}"
         try:
-            async with httpx.AsyncClient(timeout=5) as client:
-                resp = await client.get(url)
-                resp.raise_for_status()
-                data = resp.json()
+            track = await self._fetch_first_result(url)
         except Exception as e:
             log_error(f"Error fetching lyrics for {artist} - {title}: {e}")
-            return [(0, "❌ Lyrics not found")]
-        if not data:
-            return [(0, "❌ Lyrics not found")]
-        track = data[0]
+            return [0.0], ["❌ Lyrics not found"]
+        if not track:
+            return [0.0], ["❌ Lyrics not found"]
         lyrics_text = track.get("syncedLyrics") or track.get("plainLyrics") or "❌ Lyrics not found"
         if isinstance(lyrics_text, str) and lyrics_text.startswith("http"):
             try:
-                async with httpx.AsyncClient(timeout=5) as client:
-                    lyrics_text = await client.get(lyrics_text).text
+                lyrics_text = (await self._get_client().get(lyrics_text)).text
             except Exception as e:
                 log_error(f"Failed to download lyrics from URL for {artist} - {title}: {e}")
                 lyrics_text = "❌ Lyrics not found"
         return self.parse_lrc(lyrics_text)
 
     @staticmethod
-    def parse_lrc(text: str) -> List[Tuple[float, str]]:
-        lines = []
+    def parse_lrc(text: str) -> Tuple[List[float], List[str]]:
+        entries = []
+        last_t = 0.0
+        needs_sort = False
         for line in text.splitlines():
-            matches = list(TIMESTAMP_RE.finditer(line))
-            if not matches:
+            # One split pass yields [prefix, mm, ss, gap, mm, ss, ..., lyric]
+            # instead of scanning with findall and re-slicing for the text.
+            parts = TIMESTAMP_RE.split(line)
+            if len(parts) == 1:
                 continue
-            lyric = line[matches[-1].end():].strip()
-            for m in matches:
+            lyric = parts[-1].strip()
+            for i in range(1, len(parts) - 1, 3):
                 try:
-                    mins = int(m.group(1))
-                    secs = float(m.group(2))
-                    lines.append((mins * 60 + secs, lyric))
+                    t = int(parts[i]) * 60 + float(parts[i + 1])
                 except Exception:
                     continue
-        return sorted(lines, key=lambda x: x[0]) if lines else [(0, "❌ No parseable lyrics found")]
+                if t < last_t:
+                    needs_sort = True
+                last_t = t
+                entries.append((t, lyric))
+        if not entries:
+            return [0.0], ["❌ No parseable lyrics found"]
+        # LRC files are almost always already in time order; only pay for
+        # the sort when an out-of-order timestamp was actually seen.
+        if needs_sort:
+            entries.sort(key=itemgetter(0))
+        # Parallel lists: bisect searches the times, the render path
+        # slices the lines without unpacking tuples per frame.
+        return [t for t, _ in entries], [l for _, l in entries]
 
 class MusicPlayer:
+    FOLLOW_FORMAT = "{{xesam:artist}}\t{{xesam:title}}\t{{position}}\t{{status}}"
+
     def __init__(self, name: str):
         self.name = name
+        self._artist: Optional[str] = None
+        self._title: Optional[str] = None
+        self._position = 0.0
+        self._position_at = time.monotonic()
+        self._playing = False
+        self._updated = asyncio.Event()
+        self._proc = None
+        self._reader_task = None
 
-    async def get_track(self) -> Tuple[Optional[str], Optional[str]]:
-        try:
-            artist = await self._run_playerctl("metadata", "xesam:artist")
-            title = await self._run_playerctl("metadata", "xesam:title")
-            return artist, title
-        except Exception as e:
-            log_error(f"Player error getting track info: {e}")
-            return None, None
+    async def start(self):
+        self._proc = await asyncio.create_subprocess_exec(
+            "playerctl", "-p", self.name, "metadata", "--follow",
+            "--format", self.FOLLOW_FORMAT,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        self._reader_task = asyncio.ensure_future(self._read_stream())
+
+    async def _read_stream(self):
+        while True:
+            line = await self._proc.stdout.readline()
+            if not line:
+                log_error(f"playerctl --follow stream ended for {self.name}")
+                break
+            try:
+                # Strip on the bytes first: one str allocation, not two.
+                self._parse_line(line.rstrip(b"\n").decode())
+            except Exception as e:
+                log_error(f"Player error parsing follow output: {e}")
+
+    def _parse_line(self, line: str):
+        parts = line.split("\t")
+        if len(parts) != 4:
+            return
+        artist, title, position, status = parts
+        self._artist = artist or None
+        self._title = title or None
+        # playerctl reports position in microseconds.
+        self._position = float(position) / 1_000_000 if position else 0.0
+        self._position_at = time.monotonic()
+        self._playing = status == "Playing"
+        self._updated.set()
+
+    def get_track(self) -> Tuple[Optional[str], Optional[str]]:
+        return self._artist, self._title
 
-    async def get_position(self) -> float:
+    def poll(self) -> Tuple[Optional[str], Optional[str], float]:
+        # One consistent artist/title/position snapshot per tick, so the
+        # position can never belong to a different track than the metadata.
+        return self._artist, self._title, self.get_position()
+
+    def get_position(self) -> float:
+        # playerctl only re-emits on property changes, so interpolate
+        # between events while playback is running.
+        if self._playing:
+            return self._position + (time.monotonic() - self._position_at)
+        return self._position
+
+    async def wait_update(self, timeout: float) -> bool:
+        """Sleep until the player reports a change, at most `timeout` seconds."""
+        self._updated.clear()
         try:
-            pos = await self._run_playerctl("position")
-            return float(pos) if pos else 0.0
-        except Exception as e:
-            log_error(f"Player error getting position: {e}")
-            return 0.0
+            await asyncio.wait_for(self._updated.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def aclose(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._proc is not None:
+            if self._proc.returncode is None:
+                self._proc.kill()
+            await self._proc.wait()
+            self._proc = None
 
-    async def _run_playerctl(self, *args) -> Optional[str]:
+async def _probe_player(name: str) -> Optional[str]:
+    try:
         proc = await asyncio.create_subprocess_exec(
-            "playerctl", "-p", self.name, *args,
+            "playerctl", "position", "-p", name,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE
         )
-        try:
-            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=2)
-            return stdout.decode().strip()
-        except asyncio.TimeoutError:
-            proc.kill()
-            await proc.wait()
-            log_error(f"Timeout running playerctl for {self.name} args {args}")
-            return None
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=2)
+        # float() accepts bytes directly; no need to decode the position.
+        pos = stdout.strip()
+        if pos and float(pos) >= 0:
+            return name
+    except Exception:
+        pass
+    return None
 
-def choose_player(forced: Optional[str] = None) -> Optional[str]:
+async def choose_player(forced: Optional[str] = None) -> Optional[str]:
     if forced:
         return forced
     try:
-        players = subprocess.check_output(["playerctl", "-l"], text=True).strip().splitlines()
+        proc = await asyncio.create_subprocess_exec(
+            "playerctl", "-l",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, _ = await proc.communicate()
+        players = stdout.decode().strip().splitlines()
     except Exception:
         return None
-    for p in players:
-        try:
-            pos = subprocess.check_output(["playerctl", "position", "-p", p], text=True).strip()
-            if pos and float(pos) >= 0:
-                return p
-        except Exception:
-            continue
+    # Probe every player concurrently; gather keeps list order, so the
+    # first responsive player still wins like the old sequential loop.
+    results = await asyncio.gather(*(_probe_player(p) for p in players))
+    for name in results:
+        if name:
+            return name
     return None
 
 class WindowManager:
@@ -146,60 +381,78 @@ class WindowManager:
         top = max(0, bottom - self.size)
         return top, bottom
 
-def render_panel(lyrics: List[Tuple[float, str]], current_time: float,
-                 artist: str, title: str, window_mgr: WindowManager) -> Panel:
-    idx = 0
-    for i in range(len(lyrics)-1):
-        if lyrics[i][0] <= current_time < lyrics[i+1][0]:
-            idx = i
-            break
-    else:
-        idx = len(lyrics) - 1
-    start, end = window_mgr.get_indices(idx, len(lyrics))
+def render_panel(bundle: LyricsBundle, idx: int,
+                 window_mgr: WindowManager) -> Tuple[Panel, str]:
+    start, end = window_mgr.get_indices(idx, len(bundle.styled_dim))
     content = []
     for i in range(start, end):
-        _, line = lyrics[i]
         if i == idx:
-            content.append(f"[black on cyan]{line}[/black on cyan]")
+            content.append(bundle.styled_active[i])
         elif abs(i - idx) == 1:
-            content.append(f"[bright_white]{line}[/bright_white]")
+            content.append(bundle.styled_bright[i])
         else:
-            content.append(f"[dim]{line}[/dim]")
+            content.append(bundle.styled_dim[i])
     panel_content = "\n".join(content)
-    return Panel(Align.center(panel_content), title=f"[bold green]{artist} - {title}[/bold green]")
+    panel = Panel(Align.center(panel_content), title=bundle.panel_title)
+    return panel, panel_content
 
 async def run_lyrics(player_name: str, window: int, cache_size: int):
     player = MusicPlayer(player_name)
     lyrics_mgr = LyricsManager(cache_size=cache_size)
     window_mgr = WindowManager(window)
     last_track = None
-    lyrics_lines = [(0, "❌ Lyrics not found")]
+    last_idx = None
+    prev_content_hash = None
+    bundle = LyricsBundle.build([0.0], ["❌ Lyrics not found"], None, None)
 
-    with Live(console=console, refresh_per_second=10) as live:
+    await player.start()
+    # auto_refresh off: the loop below refreshes explicitly, and only on
+    # frames whose content actually changed.
+    with Live(console=console, auto_refresh=False) as live:
         try:
             while True:
-                artist, title = await player.get_track()
+                artist, title, pos = player.poll()
                 if not artist or not title:
-                    await asyncio.sleep(0.5)
+                    await player.wait_update(0.5)
                     continue
 
                 track_key = f"{artist} - {title}"
                 if track_key != last_track:
                     try:
-                        new_lyrics = await lyrics_mgr.get_lyrics(artist, title)
-                        if new_lyrics:
-                            lyrics_lines = new_lyrics
+                        bundle = await lyrics_mgr.get_lyrics(artist, title)
                     except Exception as e:
                         log_error(f"Error updating lyrics for {track_key}: {e}")
                     last_track = track_key
+                    last_idx = None
 
-                pos = await player.get_position()
-                panel = render_panel(lyrics_lines, pos, artist or "Unknown", title or "Unknown", window_mgr)
-                live.update(panel)
-                await asyncio.sleep(0.1)
+                idx = bisect.bisect_right(bundle.times, pos) - 1
+                if idx < 0:
+                    idx = 0
+                # Rebuild the panel only when the highlighted line moves,
+                # and push it to Live only when its content actually differs.
+                if idx != last_idx:
+                    panel, panel_content = render_panel(bundle, idx, window_mgr)
+                    last_idx = idx
+                    # The track key is hashed in too so a new track whose
+                    # visible lines happen to match still redraws its title.
+                    content_hash = hash((track_key, panel_content))
+                    if content_hash != prev_content_hash:
+                        live.update(panel, refresh=True)
+                        prev_content_hash = content_hash
+                # Sleep until the next lyric boundary or a player event,
+                # instead of waking at a fixed 10 Hz. Capped at 1s so
+                # missed seek/pause events self-correct quickly.
+                if idx + 1 < len(bundle.times):
+                    delay = bundle.times[idx + 1] - pos
+                else:
+                    delay = 1.0
+                await player.wait_update(min(max(delay, 0.05), 1.0))
         except KeyboardInterrupt:
             console.clear()
             console.print("[bold yellow]Exited lyrics display[/bold yellow]")
+        finally:
+            await player.aclose()
+            await lyrics_mgr.aclose()
 
 def main():
     import argparse
@@ -209,7 +462,7 @@ def main():
     parser.add_argument("--cache-size", type=int, default=50, help="Lyrics cache size")
     args = parser.parse_args()
 
-    player_name = choose_player(args.player)
+    player_name = asyncio.run(choose_player(args.player))
     if not player_name:
         console.print("[bold red]❌ No active player found[/bold red]")
         return